@@ -1,156 +1,395 @@
+import math
+from functools import partial
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    _HAS_NUMBA = True
+except ImportError:  # numba is optional, fall back to the pure Python paths
+    _HAS_NUMBA = False
+
+
+def _spread2(x):
+    """Spread the low 32 bits of x so a zero bit sits between each of them."""
+    x = (x | (x << 16)) & 0x0000FFFF0000FFFF
+    x = (x | (x << 8)) & 0x00FF00FF00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F0F0F0F0F
+    x = (x | (x << 2)) & 0x3333333333333333
+    x = (x | (x << 1)) & 0x5555555555555555
+    return x
+
+
+def _compact2(x):
+    """Inverse of _spread2: gather every other bit of x into the low 32 bits."""
+    x = x & 0x5555555555555555
+    x = (x | (x >> 1)) & 0x3333333333333333
+    x = (x | (x >> 2)) & 0x0F0F0F0F0F0F0F0F
+    x = (x | (x >> 4)) & 0x00FF00FF00FF00FF
+    x = (x | (x >> 8)) & 0x0000FFFF0000FFFF
+    x = (x | (x >> 16)) & 0x00000000FFFFFFFF
+    return x
+
+
+def _spread5(x: int) -> int:
+    """Spread the 5-bit groups of x (up to 16 of them) into one byte each."""
+    x = (x & 0xFFFFFFFFFF) | ((x & 0xFFFFFFFFFF0000000000) << 24)
+    x = (x & 0x00000000000FFFFF00000000000FFFFF) | (
+        (x & 0x000000FFFFF00000000000FFFFF00000) << 12
+    )
+    x = (x & 0x000003FF000003FF000003FF000003FF) | (
+        (x & 0x000FFC00000FFC00000FFC00000FFC00) << 6
+    )
+    x = (x & 0x001F001F001F001F001F001F001F001F) | (
+        (x & 0x03E003E003E003E003E003E003E003E0) << 3
+    )
+    return x
+
+
+def _to_grid_np(values, lo, hi, bits):
+    """Scale an array onto the 2**bits integer grid, clamping to its edges.
+
+    Binary subdivision is equivalent to this scaling. `values - lo` allocates
+    one float scratch array that the scale, floor and clip steps reuse in
+    place; the final cast allocates the uint64 result.
+    """
+    grid = values - lo
+    grid /= hi - lo
+    grid *= 1 << bits
+    np.floor(grid, out=grid)
+    np.clip(grid, 0, (1 << bits) - 1, out=grid)
+    return grid.astype(np.uint64)
+
+
+class _InvalidCharacter(ValueError):
+    """Raised by the numba decode with the index of the offending character."""
+
+
+def _invalid_character(char: str) -> ValueError:
+    """Build the error every decode path raises for a non-base32 character."""
+    return ValueError(f"Invalid character in geohash: {char!r}")
+
+
+_DIRECTIONS = (
+    ("n", 1, 0),
+    ("s", -1, 0),
+    ("e", 0, 1),
+    ("w", 0, -1),
+    ("ne", 1, 1),
+    ("se", -1, 1),
+    ("nw", 1, -1),
+    ("sw", -1, -1),
+)
+
+
 class Geohash:
+    __slots__ = (
+        "_precision",
+        "_bit_length",
+        "_lat_bits",
+        "_lon_bits",
+        "_encode_impl",
+        "_decode_impl",
+    )
+
     BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"  # Standard Base32 characters
+    _B32_ENCODE = BASE32.encode("ascii")
+    _B32_TRANSLATE = _B32_ENCODE * 8  # byte value -> base32 char, for 0-31
+    _B32_ENCODE_NP = np.frombuffer(_B32_ENCODE, dtype=np.uint8)
+    _B32_DECODE_NP = np.full(256, 0xFF, dtype=np.uint8)
+    _B32_DECODE_NP[_B32_ENCODE_NP] = np.arange(32, dtype=np.uint8)
+    _B32_DECODE = _B32_DECODE_NP.tobytes()  # ASCII code -> value, 0xFF if invalid
 
     def __init__(self, precision: int = 5):
         """Initialize Geohash encoder/decoder with given precision."""
         if not 1 <= precision <= 12:  # 12 is standard max precision
             raise ValueError("Precision must be between 1 and 12")
-        self.precision = precision
+        # Precision is fixed at construction, so derive the bit counts once
+        self._precision = precision
+        self._bit_length = precision * 5
+        self._lat_bits = self._bit_length // 2
+        self._lon_bits = self._bit_length - self._lat_bits
+        if _HAS_NUMBA:
+            self._encode_impl = partial(_encode_nb, precision=precision)
+            self._decode_impl = self._decode_jit
+        else:
+            self._encode_impl = self._encode_unchecked
+            self._decode_impl = self._decode_py
+
+    @property
+    def precision(self) -> int:
+        """Length of the geohashes produced and accepted by this instance."""
+        return self._precision
 
     def _encode_bitstream(
         self, value: float, lo: float, hi: float, bit_length: int
-    ) -> list[int]:
-        """Encodes a value into a bitstream using binary subdivision."""
-        if not lo <= value <= hi:
-            raise ValueError(f"Value {value} must be between {lo} and {hi}")
-
-        res = []
-        for _ in range(bit_length):
-            mid = (lo + hi) / 2
-            if value > mid:
-                lo = mid
-                res.append(1)
-            else:
-                hi = mid
-                res.append(0)
-        return res
+    ) -> int:
+        """Encodes a value in [lo, hi] into a bitstream on the integer grid."""
+        cells = 1 << bit_length
+        return min(int((value - lo) / (hi - lo) * cells), cells - 1)
 
     def encode(self, lat: float, lon: float) -> str:
-        """Encode a latitude and longitude into a geohash."""
-        bit_length = self.precision * 5
-        lat_bits = bit_length // 2
-        lon_bits = bit_length - lat_bits
+        """Encode a latitude and longitude into a geohash.
 
-        lat_stream = self._encode_bitstream(lat, -90, 90, lat_bits)
-        lon_stream = self._encode_bitstream(lon, -180, 180, lon_bits)
-
-        # Interleave bits more safely
-        geohash_bits = []
-        for i in range(max(lat_bits, lon_bits)):
-            if i < lon_bits:
-                geohash_bits.append(lon_stream[i])
-            if i < lat_bits:
-                geohash_bits.append(lat_stream[i])
+        Out of range coordinates are clamped to [-90, 90] and [-180, 180].
+        """
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            raise ValueError("Coordinates must be finite")
+        lat = max(min(lat, 90.0), -90.0)
+        lon = max(min(lon, 180.0), -180.0)
+        return self._encode_impl(lat, lon)
 
-        # Convert to base32
-        result = []
-        for i in range(0, bit_length, 5):
-            chunk = geohash_bits[i : i + 5]
-            # Pad with zeros if needed
-            chunk.extend([0] * (5 - len(chunk)))
+    def _encode_unchecked(self, lat: float, lon: float) -> str:
+        """Pure Python implementation of encode, for in-range coordinates."""
+        lat_stream = self._encode_bitstream(lat, -90, 90, self._lat_bits)
+        lon_stream = self._encode_bitstream(lon, -180, 180, self._lon_bits)
+        return self._encode_streams(lat_stream, lon_stream)
 
-            value = sum(bit << (4 - j) for j, bit in enumerate(chunk))
-            result.append(self.BASE32[value])
+    def _encode_streams(self, lat_stream: int, lon_stream: int) -> str:
+        """Interleave the lat/lon bitstreams and convert them to base32."""
+        # Longitude takes the first bit, so it owns the last one when odd
+        if self._bit_length % 2:
+            geohash_value = (_spread2(lat_stream) << 1) | _spread2(lon_stream)
+        else:
+            geohash_value = (_spread2(lon_stream) << 1) | _spread2(lat_stream)
 
-        return "".join(result)
+        # Convert to base32: one 5-bit group per byte, then map them all in C
+        packed = _spread5(geohash_value).to_bytes(self._precision, "big")
+        return packed.translate(self._B32_TRANSLATE).decode("ascii")
 
     def _decode_bitstream(
         self, bitstream: int, bit_count: int, min_val: float, max_val: float
     ) -> float:
-        """Decodes a bitstream back into a value using binary subdivision."""
-        for i in range(bit_count):
-            mid = (min_val + max_val) / 2
-            if (bitstream >> (bit_count - 1 - i)) & 1:
-                min_val = mid
-            else:
-                max_val = mid
-        return (min_val + max_val) / 2
+        """Decodes a bitstream back into the value at the center of its cell."""
+        return min_val + (bitstream + 0.5) * (max_val - min_val) / (1 << bit_count)
 
-    def decode(self, geohash: str) -> tuple[float, float]:
-        """Decode a geohash into a latitude and longitude."""
-        if len(geohash) != self.precision:
+    def _check_length(self, geohash: str) -> None:
+        """Ensure a geohash has the length this instance was configured for."""
+        if len(geohash) != self._precision:
             raise ValueError(
-                f"Geohash length {len(geohash)} doesn't match precision {self.precision}"
+                f"Geohash length {len(geohash)} doesn't match precision {self._precision}"
             )
 
-        if not all(c in self.BASE32 for c in geohash):
-            raise ValueError("Invalid character in geohash")
+    def decode(self, geohash: str) -> tuple[float, float]:
+        """Decode a geohash into a latitude and longitude."""
+        self._check_length(geohash)
+        return self._decode_impl(geohash)
 
-        bit_length = self.precision * 5
-        lat_bits = bit_length // 2
-        lon_bits = bit_length - lat_bits
+    def _decode_py(self, geohash: str) -> tuple[float, float]:
+        """Pure Python implementation of decode."""
+        lat_stream, lon_stream = self._decode_streams(geohash)
+        lat = self._decode_bitstream(lat_stream, self._lat_bits, -90, 90)
+        lon = self._decode_bitstream(lon_stream, self._lon_bits, -180, 180)
+        return lat, lon
+
+    def _decode_jit(self, geohash: str) -> tuple[float, float]:
+        """Run the numba decode, reporting bad characters like _decode_py."""
+        try:
+            return _decode_nb(geohash)
+        except _InvalidCharacter as e:
+            raise _invalid_character(geohash[e.args[0]]) from None
+
+    def _decode_streams(self, geohash: str) -> tuple[int, int]:
+        """Convert a geohash from base32 and split it into lat/lon bitstreams."""
+        try:
+            raw = geohash.encode("ascii")
+        except UnicodeEncodeError as e:
+            raise _invalid_character(geohash[e.start]) from None
+
+        # Map every character to its value in one C-level pass
+        values = raw.translate(self._B32_DECODE)
+        bad = values.find(0xFF)
+        if bad != -1:
+            raise _invalid_character(geohash[bad])
 
         # Convert from base32 to binary
         geohash_value = 0
-        for char in geohash:
-            geohash_value = (geohash_value << 5) | self.BASE32.index(char)
+        for value in values:
+            geohash_value = (geohash_value << 5) | value
 
         # Deinterleave bits
-        lat_stream = lon_stream = 0
-        for i in range(bit_length):
-            bit = (geohash_value >> (bit_length - 1 - i)) & 1
-            if i % 2 == 0:
-                lon_stream = (lon_stream << 1) | bit
-            else:
-                lat_stream = (lat_stream << 1) | bit
+        if len(raw) % 2:
+            return _compact2(geohash_value >> 1), _compact2(geohash_value)
+        return _compact2(geohash_value), _compact2(geohash_value >> 1)
 
-        lat = self._decode_bitstream(lat_stream, lat_bits, -90, 90)
-        lon = self._decode_bitstream(lon_stream, lon_bits, -180, 180)
-        return lat, lon
-
-    def _get_cell_size(self, precision: int) -> tuple[float, float]:
-        """Calculate the approximate size of a geohash cell for a given precision.
+    def encode_many(self, lats, lons) -> np.ndarray:
+        """Encode arrays of latitudes and longitudes into an array of geohashes.
 
         Args:
-            precision (int): precision/length of geohash
+            lats: array-like of latitudes, clamped to [-90, 90]
+            lons: array-like of longitudes, clamped to [-180, 180]
 
         Returns:
-            (latitude_error, longitude_error)
+            1-D array of geohash strings
         """
-        lat_bits = precision * 5 // 2
-        lon_bits = precision * 5 - lat_bits
+        lats = np.asarray(lats, dtype=np.float64).ravel()
+        lons = np.asarray(lons, dtype=np.float64).ravel()
+        if lats.shape != lons.shape:
+            raise ValueError("lats and lons must have the same length")
+        if not (np.isfinite(lats).all() and np.isfinite(lons).all()):
+            raise ValueError("Coordinates must be finite")
+
+        bit_length = self._bit_length
+        lat_bits = self._lat_bits
+        lon_bits = self._lon_bits
+
+        if _HAS_NUMBA:
+            codes = _encode_codes_nb(lats, lons, lat_bits, lon_bits)
+        else:
+            lat_int = _to_grid_np(lats, -90, 90, lat_bits)
+            lon_int = _to_grid_np(lons, -180, 180, lon_bits)
+
+            # Longitude takes the first bit, so it owns the last one when odd
+            if bit_length % 2:
+                codes = (_spread2(lat_int) << 1) | _spread2(lon_int)
+            else:
+                codes = (_spread2(lon_int) << 1) | _spread2(lat_int)
+
+        # Convert to base32, most significant 5 bits first
+        shifts = np.arange(bit_length - 5, -1, -5, dtype=np.uint64)
+        digits = codes[:, None] >> shifts
+        digits &= 0x1F
+        chars = self._B32_ENCODE_NP[digits]
+        return chars.view(f"S{self._precision}").ravel().astype(str)
+
+    def decode_many(self, geohashes) -> tuple[np.ndarray, np.ndarray]:
+        """Decode an array of geohashes into arrays of latitudes and longitudes."""
+        geohashes = np.asarray(geohashes).ravel()
+        if geohashes.size == 0:
+            return np.empty(0), np.empty(0)
+        if geohashes.dtype.kind not in "SU":
+            raise ValueError("Geohashes must be strings")
+
+        # The dtype width is at least the longest geohash and shorter ones are
+        # NUL padded, so lengths are checked on the bytes rather than per string
+        width = geohashes.dtype.itemsize // (4 if geohashes.dtype.kind == "U" else 1)
+        length_error = ValueError(
+            f"Geohash length doesn't match precision {self._precision}"
+        )
+        if width < self._precision:
+            raise length_error
+
+        try:
+            raw = geohashes.astype(f"S{width}")
+        except UnicodeEncodeError as e:
+            raise _invalid_character(e.object[e.start]) from None
+        chars = raw.view(np.uint8).reshape(-1, width)
+        if width > self._precision:
+            if chars[:, self._precision :].any():
+                raise length_error
+            chars = chars[:, : self._precision]
+        values = self._B32_DECODE_NP[chars]
+        invalid = values == 0xFF
+        if invalid.any():
+            bad = int(chars[invalid][0])
+            if bad == 0:
+                raise length_error
+            raise _invalid_character(chr(bad))
+
+        bit_length = self._bit_length
+        lat_bits = self._lat_bits
+        lon_bits = self._lon_bits
+
+        # Convert from base32 to binary
+        shifts = np.arange(bit_length - 5, -1, -5, dtype=np.uint64)
+        codes = np.bitwise_or.reduce(values.astype(np.uint64) << shifts, axis=1)
 
-        lat_err = 180.0 / (1 << lat_bits)
-        lon_err = 360.0 / (1 << lon_bits)
+        # Deinterleave bits
+        if bit_length % 2:
+            lat_int, lon_int = _compact2(codes >> 1), _compact2(codes)
+        else:
+            lat_int, lon_int = _compact2(codes), _compact2(codes >> 1)
 
-        return lat_err, lon_err
+        lats = -90 + (lat_int + 0.5) * 180 / (1 << lat_bits)
+        lons = -180 + (lon_int + 0.5) * 360 / (1 << lon_bits)
+        return lats, lons
 
     def get_neighbors(self, geohash: str) -> dict[str, str]:
         """
         Compute the 8 neighboring geohashes (N, S, E, W, NE, NW, SE, SW).
         """
-        center_lat, center_lon = self.decode(geohash)
-        lat_height, lon_width = self._get_cell_size(len(geohash))
-        directions = {
-            "n": (lat_height, 0),
-            "s": (-lat_height, 0),
-            "e": (0, lon_width),
-            "w": (0, -lon_width),
-            "ne": (lat_height, lon_width),
-            "se": (-lat_height, lon_width),
-            "nw": (lat_height, -lon_width),
-            "sw": (-lat_height, -lon_width),
-        }
+        self._check_length(geohash)
+        lat_stream, lon_stream = self._decode_streams(geohash)
+
+        # Step on the integer grid directly instead of re-encoding floats
+        lat_max = (1 << self._lat_bits) - 1
+        lon_cells = 1 << self._lon_bits
+
         neighbors = {}
-        for direction, (dlat, dlon) in directions.items():
-            nlat, nlon = center_lat + dlat, center_lon + dlon
-
-            # handle latitude bounds
-            if nlat > 90:
-                nlat = 90
-            elif nlat < -90:
-                nlat = -90
-
-            # handle longitude wrapping
-            if nlon > 180:
-                nlon -= 360
-            elif nlon < -180:
-                nlon += 360
-
-            neighbors[direction] = self.encode(nlat, nlon)
+        for direction, dlat, dlon in _DIRECTIONS:
+            # clamp latitude at the poles, wrap longitude around the antimeridian
+            nlat = min(max(lat_stream + dlat, 0), lat_max)
+            nlon = (lon_stream + dlon) % lon_cells
+            neighbors[direction] = self._encode_streams(nlat, nlon)
         return neighbors
 
 
+if _HAS_NUMBA:
+    _B32_CHARS = Geohash.BASE32
+    _B32_DECODE_NB = Geohash._B32_DECODE_NP[48:123]  # indexed by ord(c) - 48
+    _spread2_nb = njit(cache=True)(_spread2)
+    _compact2_nb = njit(cache=True)(_compact2)
+
+    @njit(cache=True)
+    def _encode_code_nb(lat, lon, lat_bits, lon_bits):
+        """Scale lat/lon onto the integer grid, clamping to it, and interleave."""
+        lat_cells = 1 << lat_bits
+        lon_cells = 1 << lon_bits
+        lat_int = max(min(int((lat + 90) / 180 * lat_cells), lat_cells - 1), 0)
+        lon_int = max(min(int((lon + 180) / 360 * lon_cells), lon_cells - 1), 0)
+        if (lat_bits + lon_bits) % 2:
+            return (_spread2_nb(lat_int) << 1) | _spread2_nb(lon_int)
+        return (_spread2_nb(lon_int) << 1) | _spread2_nb(lat_int)
+
+    @njit(cache=True)
+    def _encode_nb(lat, lon, precision):
+        """JIT compiled implementation of Geohash.encode."""
+        bit_length = precision * 5
+        lat_bits = bit_length // 2
+        code = _encode_code_nb(lat, lon, lat_bits, bit_length - lat_bits)
+
+        geohash = ""
+        for shift in range(bit_length - 5, -1, -5):
+            geohash += _B32_CHARS[(code >> shift) & 0x1F]
+        return geohash
+
+    @njit(cache=True)
+    def _decode_nb(geohash):
+        """JIT compiled implementation of Geohash.decode."""
+        bit_length = len(geohash) * 5
+        lat_bits = bit_length // 2
+        lon_bits = bit_length - lat_bits
+
+        code = 0
+        for i in range(len(geohash)):
+            # The caller builds the message, since numba's repr() skips escapes
+            offset = ord(geohash[i]) - 48
+            if not 0 <= offset < _B32_DECODE_NB.shape[0]:
+                raise _InvalidCharacter(i)
+            value = _B32_DECODE_NB[offset]
+            if value == 0xFF:
+                raise _InvalidCharacter(i)
+            code = (code << 5) | value
+
+        if bit_length % 2:
+            lat_int, lon_int = _compact2_nb(code >> 1), _compact2_nb(code)
+        else:
+            lat_int, lon_int = _compact2_nb(code), _compact2_nb(code >> 1)
+
+        lat = -90 + (lat_int + 0.5) * 180 / (1 << lat_bits)
+        lon = -180 + (lon_int + 0.5) * 360 / (1 << lon_bits)
+        return lat, lon
+
+    @njit(parallel=True, cache=True)
+    def _encode_codes_nb(lats, lons, lat_bits, lon_bits):
+        """Compute the interleaved geohash bits for a batch of points."""
+        codes = np.empty(lats.shape[0], dtype=np.uint64)
+        for i in prange(lats.shape[0]):
+            codes[i] = _encode_code_nb(lats[i], lons[i], lat_bits, lon_bits)
+        return codes
+
+
 if __name__ == "__main__":
     geo = Geohash(precision=6)
     encoded = geo.encode(41.878738, -87.6359612)  # Willis Tower
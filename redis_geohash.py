@@ -1,18 +1,54 @@
 import redis
 import uuid
 from datetime import datetime
-import random
+from itertools import chain
+
+import numpy as np
 
 r = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
+# Raw replies for the bulk geo/zset paths, decoded only where returned
+r_bytes = redis.Redis(host="localhost", port=6379, db=0)
+rng = np.random.default_rng()
 MAX_INITIAL_RESULTS = 150  # Set a reasonable limit
+CUISINES = ["Italian", "Mexican", "Chinese", "Indian", "American"]
+VEHICLES = ["car", "bike", "scooter"]
+
+# Refresh the cached first page of a search if it is missing or about to
+# expire (TTL is -2 for a missing key), then return the requested slice.
+# GEOSEARCHSTORE writes the matches with their distances as scores straight
+# into the cache, and the whole script is a single round trip.
+PAGINATE_LUA = """
+if ARGV[1] == '1' and redis.call('TTL', KEYS[1]) < 60 then
+    redis.call(
+        'GEOSEARCHSTORE', KEYS[1], KEYS[2], 'FROMLONLAT', ARGV[2], ARGV[3],
+        'BYRADIUS', ARGV[4], ARGV[5], 'ASC', 'COUNT', ARGV[6], 'STOREDIST'
+    )
+    redis.call('EXPIRE', KEYS[1], 600)
+end
+return redis.call('ZRANGE', KEYS[1], ARGV[7], ARGV[8], 'WITHSCORES')
+"""
+paginate_script = r_bytes.register_script(PAGINATE_LUA)  # EVALSHA, loaded on first use
 
 
 def generate_coordinates(base_lat, base_lon, radius_km=5):
+    (lat,), (lon,) = generate_coordinates_batch(base_lat, base_lon, 1, radius_km)
+    return lat, lon
+
+
+def generate_coordinates_batch(base_lat, base_lon, n, radius_km=5):
     # Crude approximation: 1 degree lat/lng ~= 111km at equator
     # We're not being precise here, just generating sample data
-    lat_offset = (random.random() - 0.5) * 2 * radius_km / 111
-    lon_offset = (random.random() - 0.5) * 2 * radius_km / 111
-    return base_lat + lat_offset, base_lon + lon_offset
+    lat_offset = (rng.random(n) - 0.5) * 2 * radius_km / 111
+    lon_offset = (rng.random(n) - 0.5) * 2 * radius_km / 111
+    return (base_lat + lat_offset).tolist(), (base_lon + lon_offset).tolist()
+
+
+def fetch_metadata(member_ids):
+    # One round trip for the whole batch instead of an HGETALL per member
+    pipe = r.pipeline(transaction=False)
+    for member_id in member_ids:
+        pipe.hgetall(f"metadata:{member_id}")
+    return pipe.execute()
 
 
 def paginate_geosearch(
@@ -30,26 +66,24 @@ def paginate_geosearch(
 
     temp_key = f"temp:{session_id}:key"
 
-    if page_num == 1 and (not r.exists(temp_key) or r.ttl(temp_key) < 60):
-        results = r.geosearch(
-            "restaurants",
-            longitude=lon,
-            latitude=lat,
-            radius=radius,
-            unit=unit,
-            withdist=True,
-            count=MAX_INITIAL_RESULTS,
-            sort="ASC",
-        )
-        pipe = r.pipeline()
-        for member_id, distance in results:
-            pipe.zadd(temp_key, {member_id: distance})
-
-        pipe.expire(temp_key, 600)  # set expiration for 10 mins
-        pipe.execute()
     start = (page_num - 1) * page_size
     end = start + page_size - 1
-    results = r.zrange(temp_key, start, end, withscores=True)
+    flat = paginate_script(
+        keys=[temp_key, key],
+        args=[
+            int(page_num == 1),
+            lon,
+            lat,
+            radius,
+            unit,
+            MAX_INITIAL_RESULTS,
+            start,
+            end,
+        ],
+    )
+    results = [
+        (member.decode(), float(score)) for member, score in zip(flat[::2], flat[1::2])
+    ]
     return session_id, results
 
 
@@ -57,14 +91,17 @@ if __name__ == "__main__":
     # Clear data
     r.delete("restaurants", "drivers", "customers")
     nyc_lat, nyc_lon = 40.7128, -74.0060
-    restaurants = []
-    for i in range(40):
-        restaurant_id = f"restaurant:{1001 + i}"
-        lat, lon = generate_coordinates(nyc_lat, nyc_lon, 7)
-        cuisine = random.choice(["Italian", "Mexican", "Chinese", "Indian", "American"])
-        rating = 3 + 2 * random.random()
-
-        r.hset(
+    restaurant_ids = [f"restaurant:{1001 + i}" for i in range(40)]
+    lats, lons = generate_coordinates_batch(nyc_lat, nyc_lon, len(restaurant_ids), 7)
+    cuisines = rng.choice(CUISINES, len(restaurant_ids)).tolist()
+    ratings = (3 + 2 * rng.random(len(restaurant_ids))).tolist()
+    restaurants = list(zip(restaurant_ids, lats, lons))
+
+    pipe = r.pipeline(transaction=False)
+    for i, (restaurant_id, cuisine, rating) in enumerate(
+        zip(restaurant_ids, cuisines, ratings)
+    ):
+        pipe.hset(
             f"metadata:{restaurant_id}",
             mapping={
                 "name": f"Restaurant {i + 1}",
@@ -73,47 +110,50 @@ if __name__ == "__main__":
                 "address": f"{i + 1} Sample Street, NYC",
             },
         )
-
-        r.geoadd("restaurants", (lon, lat, restaurant_id))
-        restaurants.append((restaurant_id, lat, lon))
+    pipe.geoadd("restaurants", list(chain(*zip(lons, lats, restaurant_ids))))
+    pipe.execute()
     print(f"Added {len(restaurants)} restaurants to Redis...")
 
-    drivers = []
-
-    for i in range(10):
-        driver_id = f"driver:{101 + i}"
-        lat, lon = generate_coordinates(nyc_lat, nyc_lon, 10)
-
-        r.hset(
+    driver_ids = [f"driver:{101 + i}" for i in range(10)]
+    lats, lons = generate_coordinates_batch(nyc_lat, nyc_lon, len(driver_ids), 10)
+    vehicles = rng.choice(VEHICLES, len(driver_ids)).tolist()
+    ratings = (3 + 2 * rng.random(len(driver_ids))).tolist()
+    drivers = list(zip(driver_ids, lats, lons))
+
+    pipe = r.pipeline(transaction=False)
+    for i, (driver_id, vehicle, rating) in enumerate(
+        zip(driver_ids, vehicles, ratings)
+    ):
+        pipe.hset(
             f"metadata:{driver_id}",
             mapping={
                 "name": f"Driver {i}",
-                "vehicle": random.choice(["car", "bike", "scooter"]),
-                "rating": 3 + 2 * random.random(),
+                "vehicle": vehicle,
+                "rating": rating,
             },
         )
-
-        r.geoadd("drivers", (lon, lat, driver_id))
-        drivers.append((driver_id, lat, lon))
+    pipe.geoadd("drivers", list(chain(*zip(lons, lats, driver_ids))))
+    pipe.execute()
     print(f"Added {len(drivers)} drivers to Redis...")
 
-    customers = []
+    customer_ids = [f"customer:{201 + i}" for i in range(5)]
+    lats, lons = generate_coordinates_batch(nyc_lat, nyc_lon, len(customer_ids), 8)
+    house_numbers = rng.integers(1, 1000, len(customer_ids)).tolist()
+    joined_date = datetime.now().strftime("%Y-%m-%d")
+    customers = list(zip(customer_ids, lats, lons))
 
-    for i in range(5):
-        customer_id = f"customer:{201 + i}"
-        lat, lon = generate_coordinates(nyc_lat, nyc_lon, 8)
-
-        r.hset(
+    pipe = r.pipeline(transaction=False)
+    for i, (customer_id, house_number) in enumerate(zip(customer_ids, house_numbers)):
+        pipe.hset(
             f"metadata:{customer_id}",
             mapping={
                 "name": f"Customer {i}",
-                "address": f"{random.randint(1, 999)} Customer Avenue, NYC",
-                "joined_date": datetime.now().strftime("%Y-%m-%d"),
+                "address": f"{house_number} Customer Avenue, NYC",
+                "joined_date": joined_date,
             },
         )
-
-        r.geoadd("customers", (lon, lat, customer_id))
-        customers.append((customer_id, lat, lon))
+    pipe.geoadd("customers", list(chain(*zip(lons, lats, customer_ids))))
+    pipe.execute()
 
     print(f"Added {len(customers)} customers to Redis...")
 
@@ -131,8 +171,7 @@ if __name__ == "__main__":
     )
 
     print(f"Found {len(res)} restaurants near {customer_id}")
-    for rid, dist in res:
-        metadata = r.hgetall(f"metadata:{rid}")
+    for (rid, dist), metadata in zip(res, fetch_metadata(rid for rid, _ in res)):
         print(f" - {metadata['name']} ({metadata['cuisine']}) - {dist:.2f} km away")
 
     # Retrieving restaurants in a radius of x around another restaurant
@@ -148,8 +187,7 @@ if __name__ == "__main__":
     )
 
     print(f"Found {len(res)} restaurants near {restaurant_id}")
-    for rid, dist in res:
-        metadata = r.hgetall(f"metadata:{rid}")
+    for (rid, dist), metadata in zip(res, fetch_metadata(rid for rid, _ in res)):
         print(f" - {metadata['name']} ({metadata['cuisine']}) - {dist:.2f} km away")
 
     # Retrieving Restaurants from a bounding box centered around customer
@@ -165,8 +203,7 @@ if __name__ == "__main__":
     )
 
     print(f"Found {len(res)} restaurants in 4x4 km box around {customer_id}:")
-    for rid, dist in res:
-        metadata = r.hgetall(f"metadata:{rid}")
+    for (rid, dist), metadata in zip(res, fetch_metadata(rid for rid, _ in res)):
         print(f" - {metadata['name']} ({metadata['cuisine']}) - {dist:.2f} km away")
 
     # Pagination for large result sets
@@ -176,8 +213,7 @@ if __name__ == "__main__":
             "restaurants", nyc_lon, nyc_lat, 6, page_num=i + 1, session_id=session_id
         )
         print(f"Closest restaurants to NYC {nyc_lat}, {nyc_lon} Page {i + 1} results")
-        for rid, dist in res:
-            metadata = r.hgetall(f"metadata:{rid}")
+        for (rid, dist), metadata in zip(res, fetch_metadata(rid for rid, _ in res)):
             print(f" - {metadata['name']} ({metadata['cuisine']}) - {dist:.2f} km away")
 
     # Clean up
@@ -0,0 +1,197 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+import geohash
+from geohash import Geohash
+
+PRECISIONS = range(1, 13)
+# Points on cell boundaries, where rounding differences would show up first
+EDGE_POINTS = [
+    (0.0, 0.0),
+    (90.0, 180.0),
+    (-90.0, -180.0),
+    (90.0, 0.0),
+    (0.0, -180.0),
+    (45.0, 90.0),
+    (-22.5, 135.0),
+]
+
+
+def random_points(n=500, seed=0):
+    rng = random.Random(seed)
+    return [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(n)]
+
+
+@pytest.fixture(params=["python", "numba"])
+def backend(request, monkeypatch):
+    """Run a test against both the pure Python and the numba paths."""
+    if request.param == "numba" and not geohash._HAS_NUMBA:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(geohash, "_HAS_NUMBA", request.param == "numba")
+    return request.param
+
+
+@pytest.mark.skipif(not geohash._HAS_NUMBA, reason="numba is not installed")
+@pytest.mark.parametrize("precision", PRECISIONS)
+def test_backends_agree(precision, monkeypatch):
+    points = random_points() + EDGE_POINTS
+    results = {}
+    for use_numba in (False, True):
+        monkeypatch.setattr(geohash, "_HAS_NUMBA", use_numba)
+        geo = Geohash(precision)
+        hashes = [geo.encode(lat, lon) for lat, lon in points]
+        results[use_numba] = hashes, [geo.decode(h) for h in hashes]
+    assert results[False] == results[True]
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("precision", PRECISIONS)
+def test_encode_many_matches_encode(precision):
+    geo = Geohash(precision)
+    points = random_points() + EDGE_POINTS
+    lats, lons = np.array(points).T
+
+    expected = [geo.encode(lat, lon) for lat, lon in points]
+    assert geo.encode_many(lats, lons).tolist() == expected
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("precision", PRECISIONS)
+def test_decode_many_matches_decode(precision):
+    geo = Geohash(precision)
+    hashes = [geo.encode(lat, lon) for lat, lon in random_points() + EDGE_POINTS]
+
+    lats, lons = geo.decode_many(hashes)
+    assert list(zip(lats.tolist(), lons.tolist())) == [geo.decode(h) for h in hashes]
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), -float("inf")])
+def test_encode_many_rejects_non_finite(bad):
+    geo = Geohash(5)
+    with pytest.raises(ValueError):
+        geo.encode_many([0.0, bad], [0.0, 0.0])
+    with pytest.raises(ValueError):
+        geo.encode_many([0.0, 0.0], [0.0, bad])
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize(
+    "hashes",
+    [
+        np.array(["dp3wj", "9q8yy"], dtype="U8"),
+        np.array([b"dp3wj", b"9q8yy"], dtype="S8"),
+        np.array(["dp3wj", "dp3wjz"])[:1],
+    ],
+)
+def test_decode_many_accepts_wider_dtypes(hashes):
+    geo = Geohash(5)
+    lats, lons = geo.decode_many(hashes)
+    expected = [
+        geo.decode(str(h, "ascii") if isinstance(h, bytes) else h) for h in hashes
+    ]
+    assert list(zip(lats.tolist(), lons.tolist())) == expected
+
+
+@pytest.mark.usefixtures("backend")
+def test_decode_many_errors():
+    geo = Geohash(5)
+    with pytest.raises(ValueError, match="length"):
+        geo.decode_many(["dp3wn", "dp3w"])
+    with pytest.raises(ValueError, match="length"):
+        geo.decode_many(["dp3wn", "dp3wnx"])
+    with pytest.raises(ValueError, match="'a'"):
+        geo.decode_many(["dp3wa"])
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize(
+    "lat, lon, expected",
+    [
+        # A value exactly on a midpoint falls in the upper half, as in the
+        # standard geohash; the old bit-by-bit subdivision gave "7zzzz"
+        # and "gzzzz" here
+        (0.0, 0.0, "s0000"),
+        (90.0, 0.0, "upbpb"),
+        (41.878738, -87.6359612, "dp3wj"),
+    ],
+)
+def test_encode_known_values(lat, lon, expected):
+    geo = Geohash(5)
+    assert geo.encode(lat, lon) == expected
+    assert geo.encode_many([lat], [lon]).tolist() == [expected]
+
+
+@pytest.mark.usefixtures("backend")
+def test_decode_errors():
+    geo = Geohash(6)
+    with pytest.raises(ValueError, match="length"):
+        geo.decode("dp3wj")
+    with pytest.raises(ValueError, match="'a'"):
+        geo.decode("dp3wja")
+    with pytest.raises(ValueError, match="'é'"):
+        geo.decode("dp3wjé")
+    # Control characters are escaped the same way on every backend
+    with pytest.raises(ValueError, match=re.escape(r"'\x00'")):
+        geo.decode("dp3wj\x00")
+    with pytest.raises(ValueError, match=re.escape(r"'\t'")):
+        geo.decode("dp3wj\t")
+
+
+@pytest.mark.usefixtures("backend")
+def test_decode_returns_cell_center():
+    geo = Geohash(5)
+    lat, lon = geo.decode("dp3wj")
+    lat_err, lon_err = 180 / (1 << 12), 360 / (1 << 13)
+    assert geo.encode(lat - lat_err / 2.1, lon + lon_err / 2.1) == "dp3wj"
+    assert geo.encode(lat + lat_err / 1.9, lon) != "dp3wj"
+
+
+@pytest.mark.usefixtures("backend")
+def test_get_neighbors():
+    assert Geohash(6).get_neighbors("dp3wjz") == {
+        "n": "dp3wmb",
+        "s": "dp3wjy",
+        "e": "dp3wnp",
+        "w": "dp3wjx",
+        "ne": "dp3wq0",
+        "se": "dp3wnn",
+        "nw": "dp3wm8",
+        "sw": "dp3wjw",
+    }
+
+
+@pytest.mark.usefixtures("backend")
+def test_get_neighbors_clamps_poles_and_wraps_antimeridian():
+    neighbors = Geohash(3).get_neighbors("zzz")
+    assert neighbors["n"] == "zzz"
+    assert neighbors["e"] == "bpb"
+    assert neighbors["w"] == "zzy"
+
+
+@pytest.mark.usefixtures("backend")
+def test_get_neighbors_rejects_wrong_length():
+    with pytest.raises(ValueError, match="length"):
+        Geohash(6).get_neighbors("dp3wj")
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), -float("inf")])
+def test_encode_rejects_non_finite(bad):
+    geo = Geohash(5)
+    with pytest.raises(ValueError, match="finite"):
+        geo.encode(bad, 0.0)
+    with pytest.raises(ValueError, match="finite"):
+        geo.encode(0.0, bad)
+
+
+@pytest.mark.usefixtures("backend")
+def test_encode_clamps_out_of_range():
+    geo = Geohash(6)
+    points = [(95.0, 200.0), (-95.0, -200.0), (45.0, -190.0)]
+    expected = [geo.encode(90, 180), geo.encode(-90, -180), geo.encode(45, -180)]
+    assert [geo.encode(lat, lon) for lat, lon in points] == expected
+    assert geo.encode_many(*zip(*points)).tolist() == expected